@@ -15,14 +15,16 @@ o = click.option
 @o("-n", "--name", help="Name of the module", required=True)
 @o("-ef", "--exclude-files", help="Files to exclude", multiple=True)
 @o("-ed", "--exclude-dirs", help="Directories to exclude", multiple=True)
-def main(name: str, path: str, exclude_files: tuple[str], exclude_dirs: tuple[str]):
+@o("-fs", "--follow-symlinks", help="Follow symlinked directories and files", is_flag=True)
+def main(name: str, path: str, exclude_files: tuple[str], exclude_dirs: tuple[str], follow_symlinks: bool):
     nav = mkdocs_gen_files.nav.Nav()
     module = generator.Module(
         name=name,
         path=path or generator.get_module_path(name),
         exclude_files=list(exclude_files),
         exclude_dirs=list(exclude_dirs),
-        options=True
+        options=True,
+        follow_symlinks=follow_symlinks
     )
 
     generator.render_ref(module=module, nav=nav)
@@ -1,19 +1,65 @@
+import concurrent.futures
 import dataclasses
+import functools
 import importlib.util
 import os
 import pathlib
+import threading
 import typing
 
 import mkdocs_gen_files
 
-
+_WRITE_WORKERS = 8
+# mkdocs_gen_files registers files with a shared, non thread-safe editor on open()
+_open_lock = threading.Lock()
+
+_DEFAULT_OPTIONS = {
+    "show_root_heading": "false",
+    "allow_inspection": "false",
+    "show_root_full_path": "true",
+    "find_stubs_package": "true",
+    "show_source": "false",
+    "show_submodules": "false",
+    "members_order": "source",
+    "inherited_members": "false",
+    "summary": {
+        "attributes": True,
+        "methods": True,
+        "classes": True,
+        "modules": False
+    },
+    "imported_members": "true",
+    "docstring_section_style": "spacy",
+    "relative_crossrefs": "true",
+    "show_root_members_full_path": "false",
+    "show_object_full_path": "false",
+    "annotations_path": "source",
+    "show_category_heading": "true",
+    "group_by_category": "true",
+    "show_signature_annotations": "true",
+    "separate_signature": "true",
+    "signature_crossrefs": "true"
+}
+
+
+@functools.lru_cache(maxsize=None)
 def get_module_path(module_name: str) -> str:
     if not module_name:
         raise ValueError("module_name is required")
     spec = importlib.util.find_spec(module_name)
-    if not spec or not spec.origin:
+    if not spec:
+        raise ImportError(f"module {module_name} not found")
+    if spec.has_location:
+        origin = spec.origin
+    elif spec.submodule_search_locations:
+        # namespace packages have no origin, only the directories they span
+        origin = os.path.join(next(iter(spec.submodule_search_locations)), "")
+    else:
+        # frozen modules keep their source file in the loader state
+        origin = getattr(spec.loader_state, "filename", None)
+    if not origin:
         raise ImportError(f"module {module_name} not found")
-    return pathlib.Path(spec.origin).parent.parent.as_posix()
+    return os.path.dirname(os.path.dirname(origin)).replace(os.sep, "/")
 
 
 def dict_to_yaml(data, indent=0):
@@ -31,16 +77,17 @@ def dict_to_yaml(data, indent=0):
         >>> dict_to_yaml({'key': 'value'})
         'key: value\n'
     """
-    yaml_str = ""
+    parts = []
     for key, value in data.items():
-        yaml_str += "  " * indent + str(key) + ":"
+        parts.append("  " * indent + str(key) + ":")
         if isinstance(value, dict):
-            yaml_str += "\n" + dict_to_yaml(value, indent + 1)
+            parts.append("\n")
+            parts.append(dict_to_yaml(value, indent + 1))
         elif isinstance(value, bool):
-            yaml_str += " " + ("true" if value else "false") + "\n"
+            parts.append(" true\n" if value else " false\n")
         else:
-            yaml_str += f" {str(value)}" + "\n"
-    return yaml_str
+            parts.append(f" {value}\n")
+    return "".join(parts)
 
 
 def get_options_str(options: typing.Optional[dict] = None) -> str:
@@ -57,35 +104,21 @@ def get_options_str(options: typing.Optional[dict] = None) -> str:
         >>> get_options_str({'show_root_heading': 'true'})
         '   show_root_heading: true\n   allow_inspection: false\n...'
     """
-    defaults = {
-        "show_root_heading": "false",
-        "allow_inspection": "false",
-        "show_root_full_path": "true",
-        "find_stubs_package": "true",
-        "show_source": "false",
-        "show_submodules": "false",
-        "members_order": "source",
-        "inherited_members": "false",
-        "summary": {
-            "attributes": True,
-            "methods": True,
-            "classes": True,
-            "modules": False
-        },
-        "imported_members": "true",
-        "docstring_section_style": "spacy",
-        "relative_crossrefs": "true",
-        "show_root_members_full_path": "false",
-        "show_object_full_path": "false",
-        "annotations_path": "source",
-        "show_category_heading": "true",
-        "group_by_category": "true",
-        "show_signature_annotations": "true",
-        "separate_signature": "true",
-        "signature_crossrefs": "true"
-    }
-    options = {**defaults, **(options or {})}
-    return dict_to_yaml(options, indent=3)
+    chunks = dict(_default_options_yaml())
+    for key, value in (options or {}).items():
+        chunks[key] = dict_to_yaml({key: value}, indent=3)
+    return "".join(chunks.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _default_options_yaml() -> typing.Dict[str, str]:
+    """
+    Get the YAML formatted string of each default option, rendered once.
+
+    Returns:
+        Dict[str, str]: The YAML formatted string of each option, in the default order.
+    """
+    return {key: dict_to_yaml({key: value}, indent=3) for key, value in _DEFAULT_OPTIONS.items()}
 
 
 def get_md_content(identifier: str, options: typing.Union[dict, bool] = True) -> str:
@@ -108,14 +141,97 @@ def get_md_content(identifier: str, options: typing.Union[dict, bool] = True) ->
         >>> get_md_content("my_identifier", False)
         '::: my_identifier'
     """
+    prefix, suffix = _get_md_template(options)
+    return prefix + identifier + suffix
+
+
+def _options_key(value) -> typing.Hashable:
+    """
+    Build a hashable key for an options value, preserving key order and value types.
+
+    Args:
+        value: The options value.
+
+    Returns:
+        Hashable: The key, only hashable if all the leaf values are.
+    """
+    if isinstance(value, dict):
+        return dict, tuple((_k, _options_key(_v)) for _k, _v in value.items())
+    if isinstance(value, list):
+        return list, tuple(_options_key(_x) for _x in value)
+    return type(value), value
+
+
+def _options_from_key(key: typing.Hashable):
+    """
+    Rebuild the options value an `_options_key` was built from.
+
+    Args:
+        key (Hashable): The key, as returned by `_options_key`.
+
+    Returns:
+        The options value.
+    """
+    kind, value = key
+    if kind is dict:
+        return {_k: _options_from_key(_v) for _k, _v in value}
+    if kind is list:
+        return [_options_from_key(_x) for _x in value]
+    return value
+
+
+def _get_md_template(options: typing.Union[dict, bool]) -> typing.Tuple[str, str]:
+    """
+    Get the markdown content surrounding the identifier for the given options.
+
+    The template is rendered once per distinct options value and reused across modules.
+
+    Args:
+        options (Union[dict, bool]): Configuration options for the markdown content.
+
+    Returns:
+        Tuple[str, str]: The content before and after the identifier.
+    """
+    key = _options_key(options)
+    try:
+        hash(key)
+    except TypeError:
+        # options holding unhashable values, e.g. sets, are rendered every time
+        return _render_md_template(options)
+    return _cached_md_template(key)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_md_template(key: typing.Hashable) -> typing.Tuple[str, str]:
+    """
+    Render the markdown template for the options of the given `_options_key`, once per key.
+
+    Args:
+        key (Hashable): The key of the options, as returned by `_options_key`.
+
+    Returns:
+        Tuple[str, str]: The content before and after the identifier.
+    """
+    return _render_md_template(_options_from_key(key))
+
+
+def _render_md_template(options: typing.Union[dict, bool]) -> typing.Tuple[str, str]:
+    """
+    Render the markdown template for the given options, see `_get_md_template`.
+
+    Args:
+        options (Union[dict, bool]): Configuration options for the markdown content.
+
+    Returns:
+        Tuple[str, str]: The content before and after the identifier.
+    """
     if isinstance(options, bool) and not options or options == {}:
-        return f"::: {identifier}"
-    options = options if isinstance(options, dict) else {}
-    return f"""
-::: {identifier}
+        return "::: ", ""
+    options_str = get_options_str(options if isinstance(options, dict) else {})
+    return "\n::: ", f"""
     handler: python
     options:
-{get_options_str(options)}
+{options_str}
 """
 
 
@@ -126,30 +242,166 @@ class Module:
     exclude_files: typing.List[str]
     exclude_dirs: typing.List[str]
     options: typing.Union[dict, bool]
+    follow_symlinks: bool = False
 
 
-def should_exclude(path: pathlib.Path, exclude_files: typing.List[str], exclude_dirs: typing.List[str]) -> bool:
+def should_exclude(path: typing.Union[str, pathlib.Path],
+                   exclude_files: typing.Sequence[str],
+                   exclude_dirs: typing.Sequence[str]) -> bool:
     """
     Determine if a file should be excluded based on the exclusion lists.
 
     Args:
-        path (pathlib.Path): The file path.
-        exclude_files (list): The list of files to exclude.
-        exclude_dirs (list): The list of directories to exclude.
+        path (Union[str, pathlib.Path]): The file path.
+        exclude_files (Sequence[str]): The files to exclude.
+        exclude_dirs (Sequence[str]): The directories to exclude.
 
     Returns:
         bool: True if the file should be excluded, False otherwise.
 
     Example:
-        >>> _should_exclude(pathlib.Path('test.py'), ['test.py'], [])
+        >>> should_exclude(pathlib.Path('test.py'), ['test.py'], [])
         True
     """
-    if os.path.basename(path).startswith("_") and os.path.basename(path) not in ["__init__.py", "__main__.py"]:
+    return _should_exclude(os.path.abspath(path), tuple(exclude_files), tuple(exclude_dirs))
+
+
+def _should_exclude(path: str, exclude_files: typing.Tuple[str, ...], exclude_dirs: typing.Tuple[str, ...]) -> bool:
+    """
+    Same as `should_exclude`, for an absolute path and pre-built exclusion tuples.
+
+    Args:
+        path (str): The absolute file path.
+        exclude_files (Tuple[str, ...]): The files to exclude.
+        exclude_dirs (Tuple[str, ...]): The directories to exclude.
+
+    Returns:
+        bool: True if the file should be excluded, False otherwise.
+    """
+    name = os.path.basename(path)
+    if name.startswith("_") and name not in ("__init__.py", "__main__.py"):
         return True
-    if any(path.absolute().as_posix().endswith(_x) for _x in exclude_files):
+    if not exclude_files and not exclude_dirs:
+        return False
+    if exclude_files and path.replace(os.sep, "/").endswith(exclude_files):
         return True
-    dir_name = os.path.dirname(path)
-    return any(dir_name.endswith(_x) for _x in exclude_dirs)
+    return bool(exclude_dirs) and os.path.dirname(path).endswith(exclude_dirs)
+
+
+def _walk_py(root: str, follow_symlinks: bool = False) -> typing.Iterator[str]:
+    """
+    Walk a directory tree and yield the paths of the python modules within it.
+
+    `__main__.py` scripts are skipped, they are not documented. Nothing is yielded if `root` is not
+    a directory, and unreadable directories are skipped.
+
+    Args:
+        root (str): The directory to walk.
+        follow_symlinks (bool, optional): Whether to descend into symlinked directories and
+            yield symlinked files. A directory reachable through several paths is walked once, under
+            its real path if it is within `root`. Defaults to False.
+
+    Yields:
+        str: The path of each module found under `root`.
+    """
+    if not os.path.isdir(root):
+        return
+    stack = [root]
+    # symlinked directories are only walked once all the real ones are, so that a directory reachable
+    # both ways is documented under its real path
+    links = []
+    visited = set()
+    while stack or links:
+        directory = stack.pop() if stack else links.pop()
+        if follow_symlinks:
+            real_path = os.path.realpath(directory)
+            if real_path in visited:
+                continue
+            visited.add(real_path)
+        try:
+            entries = os.scandir(directory)
+        except PermissionError:
+            continue
+        with entries:
+            if follow_symlinks:
+                # the order entries are walked in decides which path of a directory is kept
+                entries = sorted(entries, key=lambda _x: _x.name, reverse=True)
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    (links if entry.is_symlink() else stack).append(entry.path)
+                elif (entry.name.endswith(".py") and entry.name != "__main__.py"
+                      and entry.is_file(follow_symlinks=follow_symlinks)):
+                    yield entry.path
+
+
+@dataclasses.dataclass(frozen=True)
+class _Ref:
+    parts: typing.Tuple[str, ...]
+    doc_path: str
+    full_doc_path: str
+    md_content: str
+
+
+def _scan_refs(module: Module) -> typing.List[_Ref]:
+    """
+    Walk a module and build the reference pages to generate for it, without any I/O on the docs.
+
+    Args:
+        module (Module): The module for which to generate the reference documentation.
+
+    Returns:
+        typing.List[_Ref]: The reference pages, in navigation order.
+    """
+    refs = []
+    prefix, suffix = _get_md_template(module.options)
+    exclude_files = tuple(module.exclude_files)
+    exclude_dirs = tuple(module.exclude_dirs)
+    base = os.path.join(os.path.abspath(module.path), "")
+    root = os.path.join(base, module.name)
+    paths = list(_walk_py(root, follow_symlinks=module.follow_symlinks))
+    # "\0" sorts before any character of a file name, which keeps the ordering of path components
+    paths.sort(key=lambda _x: _x.replace(os.sep, "\0"))
+    for path in paths:
+        if _should_exclude(path, exclude_files, exclude_dirs):
+            continue
+        parts = path[len(base):-len(".py")].split(os.sep)
+        if parts[-1] == "__init__":
+            parts.pop()
+            doc_path = "/".join(parts) + "/index.md"
+        else:
+            doc_path = "/".join(parts) + ".md"
+        refs.append(_Ref(parts=tuple(parts),
+                         doc_path=doc_path,
+                         full_doc_path="reference/" + doc_path,
+                         md_content=prefix + ".".join(parts) + suffix))
+    return refs
+
+
+def _write_md(full_doc_path: str, md_content: str):
+    """
+    Write a generated markdown file through mkdocs_gen_files.
+
+    Args:
+        full_doc_path (str): The path of the file, relative to docs_dir.
+        md_content (str): The markdown content to write.
+    """
+    with _open_lock:
+        fd = mkdocs_gen_files.open(full_doc_path, "w")
+    with fd:
+        fd.write(md_content + "\n")
+
+
+def _write_refs(refs: typing.List[_Ref]):
+    """
+    Write the reference pages concurrently.
+
+    Args:
+        refs (typing.List[_Ref]): The reference pages to write.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+        futures = [executor.submit(_write_md, _x.full_doc_path, _x.md_content) for _x in refs]
+        for future in futures:
+            future.result()
 
 
 def render_ref(module: Module,
@@ -164,27 +416,11 @@ def render_ref(module: Module,
     Returns:
         typing.List[str]: A list of paths to the generated documentation files.
     """
-    files = []
-    for path in sorted(pathlib.Path(module.path, module.name).rglob("*.py")):
-        if should_exclude(path, module.exclude_files, module.exclude_dirs):
-            continue
-        module_path = path.relative_to(module.path).with_suffix("")
-        doc_path = path.relative_to(module.path).with_suffix(".md")
-        full_doc_path = pathlib.Path("reference", doc_path)
-        parts = tuple(module_path.parts)
-        if parts[-1] == "__init__":
-            parts = parts[:-1]
-            doc_path = doc_path.with_name("index.md")
-            full_doc_path = full_doc_path.with_name("index.md")
-        elif parts[-1] == "__main__":
-            continue
-        nav[parts] = doc_path.as_posix()
-        files.append(full_doc_path.as_posix())
-        with mkdocs_gen_files.open(full_doc_path, "w") as fd:
-            identifier = ".".join(parts)
-            md_content = get_md_content(identifier, options=module.options)
-            print(f"{md_content}", file=fd)
-    return files
+    refs = _scan_refs(module)
+    for ref in refs:
+        nav[ref.parts] = ref.doc_path
+    _write_refs(refs)
+    return [_x.full_doc_path for _x in refs]
 
 
 def generate_summary(nav: mkdocs_gen_files.nav.Nav):
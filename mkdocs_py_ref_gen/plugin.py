@@ -29,6 +29,7 @@ class ModuleConfig(base.Config):
     exclude_files = c.Type(list, default=[])
     exclude_dirs = c.Type(list, default=[])
     options = c.Type((dict, bool), default=True)
+    follow_symlinks = c.Type(bool, default=False)
 
 
 class PluginConfig(base.Config):
@@ -68,7 +69,8 @@ class MkDocsPyRefGenPlugin(GenFilesPlugin):
                                  _x['name']),
                              exclude_files=_x.get("exclude_files", []),
                              exclude_dirs=_x.get("exclude_dirs", []),
-                             options=_x.get("options", True))
+                             options=_x.get("options", True),
+                             follow_symlinks=_x.get("follow_symlinks", False))
             for _x in self.config['modules']
         ]
         if not modules:
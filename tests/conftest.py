@@ -0,0 +1,53 @@
+import dataclasses
+import pathlib
+import shutil
+import typing
+
+import mkdocs_gen_files
+import pytest
+from mkdocs.structure.files import Files
+from mkdocs_gen_files.editor import FilesEditor
+
+from mkdocs_py_ref_gen.generator import Module, generate_summary, render_ref
+
+
+@pytest.fixture(scope="session")
+def package_root(tmp_path_factory):
+    """
+    Copies the test package once per session and returns the directory containing it.
+    """
+    root = tmp_path_factory.mktemp("packages")
+    shutil.copytree(pathlib.Path(__file__).parent / "my_test_package", root / "my_test_package",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    return root
+
+
+@dataclasses.dataclass
+class RenderedModule:
+    files: typing.List[str]
+    nav: mkdocs_gen_files.nav.Nav
+    docs_dir: pathlib.Path
+
+
+@pytest.fixture(scope="session")
+def render_module(tmp_path_factory):
+    """
+    Renders the reference documentation and summary of a module into a temporary docs directory.
+
+    Each distinct module configuration is rendered once per session and shared by the tests using it.
+    """
+    rendered: typing.Dict[str, RenderedModule] = {}
+
+    def _render(module: Module) -> RenderedModule:
+        key = repr(module)
+        if key not in rendered:
+            docs_dir = tmp_path_factory.mktemp("docs")
+            config = {"site_dir": (docs_dir / "site").as_posix(), "use_directory_urls": True}
+            nav = mkdocs_gen_files.nav.Nav()
+            with FilesEditor(Files([]), config, docs_dir.as_posix()):
+                files = render_ref(module, nav)
+                generate_summary(nav)
+            rendered[key] = RenderedModule(files=files, nav=nav, docs_dir=docs_dir)
+        return rendered[key]
+
+    return _render
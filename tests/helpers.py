@@ -0,0 +1,29 @@
+import hashlib
+import os
+
+
+def walk_md_files(root):
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_md_files(entry.path)
+            elif entry.name.endswith(".md"):
+                yield entry.path
+
+
+def get_generated_md_files(path, docs_dir):
+    prefix_len = len(os.path.join(docs_dir, ""))
+    return sorted(_x[prefix_len:].replace(os.sep, "/") for _x in walk_md_files(path))
+
+
+def compute_hash(data: bytes):
+    """
+    Computes the 128-bit BLAKE2b hash of the given bytes and returns its hexadecimal digest.
+
+    Args:
+        data (bytes): The bytes to be hashed.
+
+    Returns:
+        str: The 32 characters hexadecimal digest of the data.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
@@ -1,61 +1,98 @@
-import hashlib
+import functools
 import os
 import pathlib
-import shutil
 
-import mkdocs_gen_files
 import pytest
 
-from mkdocs_py_ref_gen.generator import (Module, dict_to_yaml,
-                                         generate_summary, get_md_content,
+from mkdocs_py_ref_gen.generator import (Module, _cached_md_template,
+                                         dict_to_yaml, get_md_content,
                                          get_module_path, get_options_str,
-                                         render_ref, should_exclude)
-
-current_folder = pathlib.Path(__file__).parent
-os.chdir(current_folder)
-
-
-@pytest.fixture(scope="function")
-def cleanup():
-    delete_ref_folder()
-    yield
-    delete_ref_folder()
-
+                                         should_exclude)
+
+from .helpers import compute_hash, get_generated_md_files
+
+_OS_PATH = pathlib.Path(os.__file__).parent.parent.as_posix()
+_REF = pathlib.PurePosixPath("reference")
+
+_DEFAULT_OPTIONS = {
+    "show_root_heading": "false",
+    "allow_inspection": "false",
+    "show_root_full_path": "true",
+    "find_stubs_package": "true",
+    "show_source": "false",
+    "show_submodules": "false",
+    "members_order": "source",
+    "inherited_members": "false",
+    "summary": {
+        "attributes": True,
+        "methods": True,
+        "classes": True,
+        "modules": False
+    },
+    "imported_members": "true",
+    "docstring_section_style": "spacy",
+    "relative_crossrefs": "true",
+    "show_root_members_full_path": "false",
+    "show_object_full_path": "false",
+    "annotations_path": "source",
+    "show_category_heading": "true",
+    "group_by_category": "true",
+    "show_signature_annotations": "true",
+    "separate_signature": "true",
+    "signature_crossrefs": "true"
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_cached_options_str(options_items: tuple = ()):
+    """
+    Cached `get_options_str`, keyed on the options items so insertion order is preserved.
 
-def delete_ref_folder():
-    folder = os.path.join("docs", "reference")
-    if os.path.exists(folder):
-        shutil.rmtree(folder)
+    Args:
+        options_items (tuple): The items of the options dictionary.
 
+    Returns:
+        str: The options as a YAML formatted string.
+    """
+    return get_options_str(dict(options_items))
 
-def get_generated_md_files(path):
-    return sorted([_x.relative_to("docs").as_posix() for _x in pathlib.Path(path).rglob("*.md")])
 
+def test_get_module_path_valid():
+    assert get_module_path("os") == _OS_PATH
 
-def compute_sha512_hash(string: str):
-    """
-    Computes the SHA-512 hash of a given string and returns the first 32 characters of the hexadecimal digest.
 
-    Args:
-        string (str): The input string to be hashed.
+def test_get_module_path_cached():
+    get_module_path.cache_clear()
+    get_module_path("pytest")
+    get_module_path("pytest")
+    assert get_module_path.cache_info().hits == 1
 
-    Returns:
-        str: The first 32 characters of the SHA-512 hexadecimal digest of the input string.
-    """
-    sha_hash = hashlib.sha512()
-    sha_hash.update(string.encode('utf-8'))
-    return sha_hash.hexdigest()[:32]
 
+def test_get_module_path_namespace(tmp_path, monkeypatch):
+    (tmp_path / "namespace_package").mkdir()
+    (tmp_path / "namespace_package" / "mod.py").touch()
+    monkeypatch.syspath_prepend(tmp_path.as_posix())
+    assert get_module_path("namespace_package") == tmp_path.as_posix()
 
-def get_file_content_hash(file_path: str):
 
-    with open(file_path) as fd:
-        return compute_sha512_hash(fd.read())
+def test_get_md_template_cached():
+    _cached_md_template.cache_clear()
+    get_md_content("a", {"show_source": "true", "summary": {"modules": True}})
+    get_md_content("b", {"show_source": "true", "summary": {"modules": True}})
+    assert _cached_md_template.cache_info().hits == 1
+    assert get_md_content("a", {"show_source": True}) != get_md_content("a", {"show_source": 1})
 
 
-def test_get_module_path_valid():
-    assert get_module_path("os") == pathlib.Path(
-        os.__file__).parent.parent.as_posix()
+def test_get_md_template_unhashable():
+    _cached_md_template.cache_clear()
+    options = {"filters": {"!^_"}}
+    assert get_md_content("a", options) == f"""
+::: a
+    handler: python
+    options:
+{get_options_str(options)}
+"""
+    assert _cached_md_template.cache_info().currsize == 0
 
 
 def test_get_module_path_invalid():
@@ -68,84 +105,23 @@ def test_get_module_path_empty():
         get_module_path("")
 
 
-def test_dict_to_yaml_simple():
-    data = {'key': 'value'}
-    expected = 'key: value\n'
-    assert dict_to_yaml(data) == expected
-
-
-def test_dict_to_yaml_nested():
-    data = {'key': {'nested_key': 'nested_value'}}
-    expected = 'key:\n  nested_key: nested_value\n'
-    assert dict_to_yaml(data) == expected
-
-
-def test_dict_to_yaml_boolean():
-    data = {'key': True}
-    expected = 'key: true\n'
+@pytest.mark.parametrize("data,expected", [
+    ({'key': 'value'}, 'key: value\n'),
+    ({'key': {'nested_key': 'nested_value'}}, 'key:\n  nested_key: nested_value\n'),
+    ({'key': True}, 'key: true\n'),
+], ids=["simple", "nested", "boolean"])
+def test_dict_to_yaml(data, expected):
     assert dict_to_yaml(data) == expected
 
 
 def test_get_options_str_default():
-    expected = dict_to_yaml({
-        "show_root_heading": "false",
-        "allow_inspection": "false",
-        "show_root_full_path": "true",
-        "find_stubs_package": "true",
-        "show_source": "false",
-        "show_submodules": "false",
-        "members_order": "source",
-        "inherited_members": "false",
-        "summary": {
-            "attributes": True,
-            "methods": True,
-            "classes": True,
-            "modules": False
-        },
-        "imported_members": "true",
-        "docstring_section_style": "spacy",
-        "relative_crossrefs": "true",
-        "show_root_members_full_path": "false",
-        "show_object_full_path": "false",
-        "annotations_path": "source",
-        "show_category_heading": "true",
-        "group_by_category": "true",
-        "show_signature_annotations": "true",
-        "separate_signature": "true",
-        "signature_crossrefs": "true"
-    }, indent=3)
+    expected = dict_to_yaml(_DEFAULT_OPTIONS, indent=3)
     assert get_options_str() == expected
 
 
 def test_get_options_str_custom():
     options = {'show_root_heading': 'true'}
-    expected = dict_to_yaml({
-        "show_root_heading": "true",
-        "allow_inspection": "false",
-        "show_root_full_path": "true",
-        "find_stubs_package": "true",
-        "show_source": "false",
-        "show_submodules": "false",
-        "members_order": "source",
-        "inherited_members": "false",
-        "summary": {
-            "attributes": True,
-            "methods": True,
-            "classes": True,
-            "modules": False
-        },
-        "imported_members": "true",
-        "docstring_section_style": "spacy",
-        "relative_crossrefs": "true",
-        "show_root_members_full_path": "false",
-        "show_object_full_path": "false",
-        "annotations_path": "source",
-        "show_category_heading": "true",
-        "group_by_category": "true",
-        "show_signature_annotations": "true",
-        "separate_signature": "true",
-        "signature_crossrefs": "true"
-    }, indent=3)
+    expected = dict_to_yaml({**_DEFAULT_OPTIONS, **options}, indent=3)
     assert get_options_str(options) == expected
 
 
@@ -155,7 +131,7 @@ def test_get_md_content_default():
 ::: {identifier}
     handler: python
     options:
-{get_options_str()}
+{get_cached_options_str()}
 """
     assert get_md_content(identifier) == expected
 
@@ -167,60 +143,111 @@ def test_get_md_content_custom():
 ::: {identifier}
     handler: python
     options:
-{get_options_str(options)}
+{get_cached_options_str(tuple(options.items()))}
 """
     assert get_md_content(identifier, options) == expected
 
 
-def test_should_exclude_file():
-    path = pathlib.Path('test.py')
-    exclude_files = ['test.py']
-    exclude_dirs = []
-    assert should_exclude(path, exclude_files, exclude_dirs) is True
-
-
-def test_should_exclude_dir():
-    path = pathlib.Path('dir/test.py')
-    exclude_files = []
-    exclude_dirs = ['dir']
-    assert should_exclude(path, exclude_files, exclude_dirs) is True
-
-
-def test_should_not_exclude():
-    path = pathlib.Path('test.py')
-    exclude_files = []
-    exclude_dirs = []
-    assert should_exclude(path, exclude_files, exclude_dirs) is False
+@pytest.mark.parametrize("path,exclude_files,exclude_dirs,expected", [
+    (pathlib.Path('test.py'), ['test.py'], [], True),
+    (pathlib.Path('dir/test.py'), [], ['dir'], True),
+    (pathlib.Path('test.py'), [], [], False),
+], ids=["file", "dir", "not_excluded"])
+def test_should_exclude(path, exclude_files, exclude_dirs, expected):
+    assert should_exclude(path, exclude_files, exclude_dirs) is expected
 
 
-def test_render_ref(cleanup):
-    module = Module(name='my_test_package', path=".",
+def test_render_ref(render_module, package_root):
+    module = Module(name='my_test_package', path=package_root.as_posix(),
                     exclude_files=[], exclude_dirs=[], options={})
-    nav = mkdocs_gen_files.nav.Nav()
-    files = sorted(render_ref(module, nav))
-    print(len(files))
+    rendered = render_module(module)
+    files = sorted(rendered.files)
     assert files == get_generated_md_files(
-        pathlib.Path("docs", "reference").as_posix()) and len(files) == 8
+        rendered.docs_dir / _REF / "my_test_package", rendered.docs_dir) and len(files) == 8
 
 
-def test_generate_summary(cleanup):
-    module = Module(name='my_test_package', path=".",
+def test_generate_summary(render_module, package_root):
+    module = Module(name='my_test_package', path=package_root.as_posix(),
                     exclude_files=[], exclude_dirs=["test_pkg_exclude"], options={})
-    nav = mkdocs_gen_files.nav.Nav()
-    render_ref(module, nav)
-    generate_summary(nav)
-    _hash = get_file_content_hash(pathlib.Path(
-        "docs", "reference", "SUMMARY.md").as_posix())
-    assert _hash == "aac82ab09c640bb199487549449cc94a"
+    rendered = render_module(module)
+    summary = (rendered.docs_dir / _REF / "SUMMARY.md").read_bytes()
+    assert summary.decode() == "".join(rendered.nav.build_literate_nav())
+    assert compute_hash(summary) == "19046d4fa5b70e7851e1e5f9b75e1964"
 
 
-def test_ref_with_default(cleanup):
+def test_ref_with_default(render_module, package_root):
     module = Module(name='test_pkg',
-                    path="my_test_package", exclude_files=['mod_b.py'],
+                    path=(package_root / "my_test_package").as_posix(), exclude_files=['mod_b.py'],
                     exclude_dirs=[], options=False)
-    nav = mkdocs_gen_files.nav.Nav()
-    render_ref(module, nav)
-    file_path = pathlib.Path(
-        "docs", "reference", "test_pkg", "mod_a.md").as_posix()
-    assert get_file_content_hash(
-        file_path) == "8597005105662df928e2a0f570a4275e"
+    rendered = render_module(module)
+    file_path = rendered.docs_dir / _REF / "test_pkg" / "mod_a.md"
+    assert compute_hash(file_path.read_bytes()) == "d20349af792bd0d098e2efb59d0f624f"
+
+
+@pytest.mark.parametrize("name,path", [
+    ("module_a", "my_test_package"),
+    ("non_existent_module", ""),
+], ids=["single_file_module", "missing"])
+def test_render_ref_not_a_package(render_module, package_root, name, path):
+    module = Module(name=name, path=(package_root / path).as_posix(),
+                    exclude_files=[], exclude_dirs=[], options=False)
+    assert render_module(module).files == []
+
+
+def test_render_ref_unreadable_dir(render_module, tmp_path, monkeypatch):
+    package = tmp_path / "unreadable_package"
+    (package / "locked").mkdir(parents=True)
+    (package / "__init__.py").touch()
+    (package / "locked" / "mod.py").touch()
+    scandir = os.scandir
+
+    def _scandir(path):
+        if os.path.basename(path) == "locked":
+            raise PermissionError(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+    module = Module(name="unreadable_package", path=tmp_path.as_posix(),
+                    exclude_files=[], exclude_dirs=[], options=False)
+    assert render_module(module).files == [str(_REF / "unreadable_package" / "index.md")]
+
+
+class _ReversedScandir(list):
+    """`os.scandir` stand-in yielding the entries in reverse order."""
+
+    def __init__(self, iterator):
+        with iterator:
+            super().__init__(reversed(list(iterator)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+@pytest.mark.parametrize("reverse_scandir", [False, True], ids=["scandir_order", "reversed_order"])
+def test_render_ref_symlinks(render_module, tmp_path, monkeypatch, reverse_scandir):
+    package = tmp_path / "linked_package"
+    package.mkdir()
+    (package / "__init__.py").touch()
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "mod_c.py").touch()
+    (package / "real").mkdir()
+    (package / "real" / "mod_d.py").touch()
+    (package / "linked").symlink_to(tmp_path / "target", target_is_directory=True)
+    (package / "alias").symlink_to(package / "real", target_is_directory=True)
+    (package / "cycle").symlink_to(package, target_is_directory=True)
+    if reverse_scandir:
+        scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: _ReversedScandir(scandir(path)))
+
+    module = Module(name="linked_package", path=tmp_path.as_posix(),
+                    exclude_files=[], exclude_dirs=[], options=False)
+    assert render_module(module).files == [str(_REF / "linked_package" / "index.md"),
+                                           str(_REF / "linked_package" / "real" / "mod_d.md")]
+
+    module.follow_symlinks = True
+    assert render_module(module).files == [str(_REF / "linked_package" / "index.md"),
+                                           str(_REF / "linked_package" / "linked" / "mod_c.md"),
+                                           str(_REF / "linked_package" / "real" / "mod_d.md")]